@@ -1,17 +1,25 @@
+import base64
 import os
+import re
+import threading
+import time
 import uuid
 import hashlib
 import json
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, Header, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel, EmailStr, Field, constr
 from dotenv import load_dotenv
 
 import psycopg
 from psycopg.rows import dict_row
 
+from .spool import IntakeSpool, start_drainer
+
 # Load secrets if present
 # Quadlet mounts /run/secrets and points EnvironmentFile=/run/secrets/leadgen.env
 load_dotenv("/run/secrets/leadgen.env", override=False)
@@ -36,7 +44,42 @@ DB_USER = os.getenv("LEADGEN_DB_USER", "postgres")
 DB_PASSWORD = os.getenv("LEADGEN_DB_PASSWORD")
 DB_SSLMODE = os.getenv("LEADGEN_DB_SSLMODE", "disable")
 
-app = FastAPI(title="Motorcade Lead Intake API", version=SERVICE_VERSION)
+# Local durable spool (LEADGEN_SPOOL): optional. When LEADGEN_SPOOL_DIR is set,
+# intake falls back to an fsync'd on-disk log if Postgres is unavailable or slower
+# than the budget below, and a background drainer replays it into app.intake_jobs.
+SPOOL_DIR = os.getenv("LEADGEN_SPOOL_DIR")
+SPOOL_SEGMENT_BYTES = int(os.getenv("LEADGEN_SPOOL_SEGMENT_BYTES", str(16 * 1024 * 1024)))
+SPOOL_DRAIN_SECONDS = float(os.getenv("LEADGEN_SPOOL_DRAIN_SECONDS", "2"))
+SPOOL_DB_CONNECT_TIMEOUT_SECONDS = int(os.getenv("LEADGEN_SPOOL_DB_CONNECT_TIMEOUT_SECONDS", "2"))
+SPOOL_DB_STATEMENT_TIMEOUT_MS = int(os.getenv("LEADGEN_SPOOL_DB_STATEMENT_TIMEOUT_MS", "1500"))
+# After a DB failure, skip straight to the spool for this long so every request
+# during an outage does not pay the connect timeout.
+SPOOL_BYPASS_SECONDS = float(os.getenv("LEADGEN_SPOOL_BYPASS_SECONDS", "5"))
+
+_SPOOL: Optional[IntakeSpool] = None
+_DB_BYPASS_UNTIL = 0.0
+
+
+@asynccontextmanager
+async def _lifespan(_app: FastAPI):
+    global _SPOOL
+    stop = threading.Event()
+    if SPOOL_DIR:
+        _SPOOL = IntakeSpool(SPOOL_DIR, segment_max_bytes=SPOOL_SEGMENT_BYTES)
+        start_drainer(
+            _SPOOL,
+            lambda: psycopg.connect(_build_dsn(), connect_timeout=5),
+            interval_seconds=SPOOL_DRAIN_SECONDS,
+            stop=stop,
+            transient_errors=(psycopg.OperationalError,),
+        )
+    try:
+        yield
+    finally:
+        stop.set()
+
+
+app = FastAPI(title="Motorcade Lead Intake API", version=SERVICE_VERSION, lifespan=_lifespan)
 
 # --- Idempotency ---
 # LEADGEN_07C: enforced via Postgres intake_jobs.idempotency_key (unique) with
@@ -58,6 +101,31 @@ def _hash_payload(payload: Any) -> str:
     return hashlib.sha256(blob).hexdigest()
 
 
+def _find_unstorable_text(value: Any, path: str = "") -> Optional[str]:
+    # Postgres text/jsonb reject NUL and lone surrogates. Reject them at intake
+    # so the Postgres and spool paths agree instead of the spool accepting a
+    # lead that can never be drained.
+    if isinstance(value, str):
+        if "\x00" in value:
+            return path
+        try:
+            value.encode("utf-8")
+        except UnicodeEncodeError:
+            return path
+        return None
+    if isinstance(value, dict):
+        for k, v in value.items():
+            found = _find_unstorable_text(v, f"{path}.{k}" if path else str(k))
+            if found is not None:
+                return found
+    if isinstance(value, (list, tuple)):
+        for i, v in enumerate(value):
+            found = _find_unstorable_text(v, f"{path}[{i}]")
+            if found is not None:
+                return found
+    return None
+
+
 def _require_intake_key(x_api_key: Optional[str]) -> None:
     # Health endpoint is unauthenticated; intake requires X-API-Key
     if not INTAKE_API_KEY:
@@ -105,6 +173,42 @@ def _build_dsn() -> str:
 _CACHED_LEADS_COLUMNS: Optional[Dict[str, str]] = None  # col_name -> udt_name
 
 
+def _build_job_payload(
+    *,
+    intake_id: str,
+    request_id: str,
+    received_at_utc: str,
+    lead_source: str,
+    payload: Dict[str, Any],
+) -> Dict[str, Any]:
+    # Wrap payload with meta so the worker can write app.leads without relying on
+    # in-memory state.
+    return {
+        "meta": {
+            "intake_id": intake_id,
+            "request_id": request_id,
+            "received_at_utc": received_at_utc,
+            "lead_source": lead_source,
+        },
+        "lead": payload,
+    }
+
+
+def _idempotency_conflict(request_id: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "status": "error",
+            "request_id": request_id,
+            "error": {
+                "code": "IDEMPOTENCY_CONFLICT",
+                "message": "Idempotency-Key reused with different payload",
+                "details": [{"field": "Idempotency-Key", "issue": "payload_mismatch"}],
+            },
+        },
+    )
+
+
 def _enqueue_intake_job(
     conn: psycopg.Connection,
     *,
@@ -126,18 +230,17 @@ def _enqueue_intake_job(
     to avoid schema drift while still returning stable ids.
     """
 
-    # Wrap payload with meta so the worker can write app.leads without relying on
-    # in-memory state.
-    job_payload = {
-        "meta": {
-            "intake_id": intake_id,
-            "request_id": request_id,
-            "received_at_utc": received_at_utc,
-            "lead_source": lead_source,
-        },
-        "lead": payload,
-    }
-    payload_hash = _hash_payload(job_payload)
+    job_payload = _build_job_payload(
+        intake_id=intake_id,
+        request_id=request_id,
+        received_at_utc=received_at_utc,
+        lead_source=lead_source,
+        payload=payload,
+    )
+    # Idempotency compares the lead only: meta (intake_id, request_id,
+    # received_at) is minted per request and would never match on a retry.
+    # The spool path uses the same hash (_spool_intake_job).
+    lead_hash = _hash_payload(payload)
 
     with conn.cursor(row_factory=dict_row) as cur:
         if idempotency_key:
@@ -154,20 +257,9 @@ def _enqueue_intake_job(
             row = cur.fetchone()
             if row is not None:
                 existing_payload = row["payload"]
-                existing_hash = _hash_payload(existing_payload)
-                if existing_hash != payload_hash:
-                    raise HTTPException(
-                        status_code=status.HTTP_409_CONFLICT,
-                        detail={
-                            "status": "error",
-                            "request_id": request_id,
-                            "error": {
-                                "code": "IDEMPOTENCY_CONFLICT",
-                                "message": "Idempotency-Key reused with different payload",
-                                "details": [{"field": "Idempotency-Key", "issue": "payload_mismatch"}],
-                            },
-                        },
-                    )
+                existing_hash = _hash_payload((existing_payload or {}).get("lead"))
+                if existing_hash != lead_hash:
+                    raise _idempotency_conflict(request_id)
 
                 meta = (existing_payload or {}).get("meta") or {}
                 return {
@@ -194,6 +286,100 @@ def _enqueue_intake_job(
     }
 
 
+def _spooled_meta(entry: Dict[str, Any], *, lead_hash: str, request_id: str) -> Dict[str, str]:
+    # Same idempotency contract (and lead-only hash) as _enqueue_intake_job,
+    # for keys not yet drained.
+    if entry.get("lead_hash") != lead_hash:
+        raise _idempotency_conflict(request_id)
+    meta = entry.get("meta") or {}
+    return {
+        "intake_id": meta.get("intake_id"),
+        "request_id": meta.get("request_id"),
+        "received_at_utc": meta.get("received_at_utc"),
+    }
+
+
+def _spool_intake_job(
+    spool: IntakeSpool,
+    *,
+    idempotency_key: Optional[str],
+    intake_id: str,
+    request_id: str,
+    received_at_utc: str,
+    lead_source: str,
+    payload: Dict[str, Any],
+) -> Dict[str, str]:
+    """Durably append an intake job to the local spool (LEADGEN_SPOOL).
+
+    The job id is minted here so a drain replayed after a crash is a no-op.
+    """
+    lead_hash = _hash_payload(payload)
+    job_payload = _build_job_payload(
+        intake_id=intake_id,
+        request_id=request_id,
+        received_at_utc=received_at_utc,
+        lead_source=lead_source,
+        payload=payload,
+    )
+    existing = spool.append({
+        "job_id": str(uuid.uuid4()),
+        "idempotency_key": idempotency_key,
+        "lead_hash": lead_hash,
+        "payload": job_payload,
+    })
+    if existing is not None:
+        return _spooled_meta(existing, lead_hash=lead_hash, request_id=request_id)
+    return {
+        "intake_id": intake_id,
+        "request_id": request_id,
+        "received_at_utc": received_at_utc,
+    }
+
+
+def _accept_intake_job(**job: Any) -> Dict[str, Any]:
+    """Enqueue in Postgres, falling back to the local spool when enabled.
+
+    Runs in the threadpool: both paths block (network / fsync), and concurrent
+    spool appends share one fsync only if they are not serialized on the loop.
+    Returns the meta plus the queue that accepted the job.
+    """
+    global _DB_BYPASS_UNTIL
+    spool = _SPOOL
+    dsn = _build_dsn()
+
+    if spool is None:
+        with psycopg.connect(dsn, connect_timeout=5) as conn:
+            return {**_enqueue_intake_job(conn, **job), "queue": "pg_outbox"}
+
+    # Keys still sitting in the spool must not be enqueued twice in Postgres.
+    entry = spool.lookup(job["idempotency_key"])
+    if entry is not None:
+        meta = _spooled_meta(entry, lead_hash=_hash_payload(job["payload"]), request_id=job["request_id"])
+        return {**meta, "queue": "spool"}
+
+    if time.monotonic() >= _DB_BYPASS_UNTIL:
+        try:
+            with psycopg.connect(
+                dsn,
+                connect_timeout=SPOOL_DB_CONNECT_TIMEOUT_SECONDS,
+                options=f"-c statement_timeout={SPOOL_DB_STATEMENT_TIMEOUT_MS}",
+            ) as conn:
+                return {**_enqueue_intake_job(conn, **job), "queue": "pg_outbox"}
+        except psycopg.OperationalError as e:
+            # Connection failures and statement-timeout cancellations only.
+            # Anything else (e.g. a concurrent same-key IntegrityError) is not an
+            # outage and must not be turned into a spooled 202.
+            _DB_BYPASS_UNTIL = time.monotonic() + SPOOL_BYPASS_SECONDS
+            print(json.dumps({
+                "event": "lead_intake_db_fallback",
+                "request_id": job["request_id"],
+                "error": str(e),
+                "time_utc": _now_utc_iso(),
+            }, separators=(",", ":"), sort_keys=True))
+
+    return {**_spool_intake_job(spool, **job), "queue": "spool"}
+
+
 def _get_leads_columns(conn: psycopg.Connection) -> Dict[str, str]:
     global _CACHED_LEADS_COLUMNS
     if _CACHED_LEADS_COLUMNS is not None:
@@ -278,6 +464,8 @@ def _insert_lead(conn: psycopg.Connection, *, intake_id: str, request_id: str, r
         record["preferred_contact_method"] = contact.get("preferred_contact_method")
     if "service_type" in cols and isinstance(req, dict):
         record["service_type"] = req.get("service_type")
+    if "notes" in cols and isinstance(req, dict):
+        record["notes"] = req.get("notes")
     if "state" in cols and isinstance(loc, dict):
         record["state"] = loc.get("state")
     if "city" in cols and isinstance(loc, dict):
@@ -368,7 +556,8 @@ def lead_health():
         "status": "ok",
         "service": SERVICE_NAME,
         "version": SERVICE_VERSION,
-        "queue": "pg_outbox",  # LEADGEN_07C: Postgres-only outbox queue
+        "queue": "pg_outbox",  # LEADGEN_07C: Postgres outbox queue
+        "spool": {"enabled": True, "pending": _SPOOL.pending()} if _SPOOL is not None else {"enabled": False},
         "db": "configured" if (DB_DSN or DB_HOST) else "missing",
         "time_utc": _now_utc_iso(),
     }
@@ -415,25 +604,40 @@ async def lead_intake(
     req_id = x_request_id or _new_id("req")
     received_at = _now_utc_iso()
 
+    lead_payload = payload.model_dump()
+    bad_field = _find_unstorable_text(lead_payload)
+    if bad_field is not None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail={
+                "status": "error",
+                "request_id": req_id,
+                "error": {
+                    "code": "VALIDATION_ERROR",
+                    "message": "Field contains characters that cannot be stored",
+                    "details": [{"field": bad_field, "issue": "unsupported_characters"}],
+                },
+            },
+        )
+
     # Normalize lead source (header overrides body context if present)
     lead_source = (x_lead_source or (payload.context.lead_source if payload.context else None) or "unknown").strip()
 
     intake_id = _new_id("li")
 
-    # Durable enqueue (LEADGEN_07C): write to app.intake_jobs.
+    # Durable enqueue (LEADGEN_07C): write to app.intake_jobs, or to the local
+    # spool when enabled and Postgres is unavailable (LEADGEN_SPOOL).
     # This is the key contract: a lead is not "accepted" unless it's durably queued.
-    dsn = _build_dsn()
     try:
-        with psycopg.connect(dsn, connect_timeout=5) as conn:
-            meta = _enqueue_intake_job(
-                conn,
-                idempotency_key=idempotency_key,
-                intake_id=intake_id,
-                request_id=req_id,
-                received_at_utc=received_at,
-                lead_source=lead_source,
-                payload=payload.model_dump(),
-            )
+        meta = await run_in_threadpool(
+            _accept_intake_job,
+            idempotency_key=idempotency_key,
+            intake_id=intake_id,
+            request_id=req_id,
+            received_at_utc=received_at,
+            lead_source=lead_source,
+            payload=lead_payload,
+        )
     except HTTPException:
         raise
     except Exception as e:
@@ -455,6 +659,7 @@ async def lead_intake(
         "request_id": req_id,
         "intake_id": meta.get("intake_id"),
         "lead_source": lead_source,
+        "queue": meta.get("queue"),
         "idempotency_key_present": bool(idempotency_key),
         "client_ip": client_host,
         "time_utc": received_at,
@@ -502,6 +707,192 @@ def admin_list_leads(
     return {"status": "ok", "count": len(rows), "limit": limit, "offset": offset, "leads": rows}
 
 
+_TYPED_ID_UDTS = ("uuid", "int2", "int4", "int8")
+
+
+def _coerce_lead_id(lead_id: str, udt_name: str) -> Any:
+    # None when lead_id cannot be a value of the id column's type.
+    if udt_name == "uuid":
+        try:
+            return uuid.UUID(lead_id)
+        except ValueError:
+            return None
+    if udt_name in ("int2", "int4", "int8"):
+        # isdigit() accepts "²" and friends, which int() rejects.
+        if not (lead_id.isascii() and lead_id.isdecimal()):
+            return None
+        value = int(lead_id)
+        return value if value < 2 ** 63 else None
+    return lead_id
+
+
+def _bad_search_param(field: str, issue: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        detail={
+            "status": "error",
+            "error": {"code": "VALIDATION_ERROR", "message": "Invalid search parameter", "details": [{"field": field, "issue": issue}]},
+        },
+    )
+
+
+def _encode_search_cursor(row: Dict[str, Any], as_of: datetime) -> str:
+    # Keyset position (score, created_at, id) plus the as_of that pins the
+    # candidate window. repr() keeps the float8 score exact.
+    blob = json.dumps(
+        [repr(row["score"]), row["created_at"].isoformat(), str(row["id"]), as_of.isoformat()],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(blob.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode_search_cursor(cursor: str, id_udt: str) -> tuple:
+    # The id is decoded in the id column's own type (uuid, integer, text).
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, created_at, lead_id, as_of = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        decoded = (
+            float(score),
+            datetime.fromisoformat(created_at),
+            _coerce_lead_id(str(lead_id), id_udt),
+            datetime.fromisoformat(as_of),
+        )
+    except Exception:
+        raise _bad_search_param("cursor", "invalid")
+    if decoded[2] is None:
+        raise _bad_search_param("cursor", "invalid")
+    return decoded
+
+
+def _like_pattern(fragment: str) -> str:
+    escaped = fragment.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+# Search needs the 20260127_01_leads_search migration (search_tsv + trigram indexes).
+_SEARCH_REQUIRED_COLUMNS = ("id", "created_at", "search_tsv", "full_name", "company", "email", "phone", "notes")
+# Ranking only considers the most recent N matches (as of the first page), so
+# broad terms (common names, "houston") return a bounded, ranked result set;
+# the response says truncated=true when older matches were left out.
+SEARCH_CANDIDATE_LIMIT = int(os.getenv("LEADGEN_SEARCH_CANDIDATE_LIMIT", "1000"))
+
+
+@app.get("/admin/leads/search")
+def admin_search_leads(
+    q: str,
+    limit: int = 25,
+    cursor: Optional[str] = None,
+    x_admin_key: Optional[str] = Header(default=None, alias="X-Admin-Key"),
+):
+    """Ranked full-text + fuzzy search over contact fields and notes.
+
+    Matches any of: full-text tokens (search_tsv), name/company/email/notes
+    fragments (trigram ILIKE), or phone digit fragments. Only the most recent
+    SEARCH_CANDIDATE_LIMIT matches created at or before as_of are ranked
+    (truncated=true when more exist); results are ordered by score, then
+    recency; page with the returned next_cursor (keyset, not OFFSET), which
+    carries as_of so later pages rank the same window.
+    """
+    _require_admin_key(x_admin_key)
+    q = q.strip()
+    if len(q) < 2 or len(q) > 200:
+        raise _bad_search_param("q", "length_2_to_200")
+    limit = max(1, min(limit, 100))
+
+    # Trigram indexes only help with >= 3 characters; shorter terms use full-text only.
+    match_clauses = ["search_tsv @@ websearch_to_tsquery('simple', %(q)s)"]
+    params: Dict[str, Any] = {
+        "q": q,
+        "limit": limit + 1,
+        "candidates": SEARCH_CANDIDATE_LIMIT,
+        "candidates_probe": SEARCH_CANDIDATE_LIMIT + 1,
+        "as_of": datetime.now(timezone.utc),
+    }
+    if len(q) >= 3:
+        params["pattern"] = _like_pattern(q)
+        match_clauses += [f"{c} ILIKE %(pattern)s" for c in ("full_name", "company", "email", "notes")]
+    digits = re.sub(r"\D", "", q)
+    if len(digits) >= 3:
+        params["digits"] = _like_pattern(digits)
+        match_clauses.append("regexp_replace(phone, '\\D', '', 'g') LIKE %(digits)s")
+
+    dsn = _build_dsn()
+    with psycopg.connect(dsn, connect_timeout=5, row_factory=dict_row) as conn:
+        cols = _get_leads_columns(conn)
+        missing = [c for c in _SEARCH_REQUIRED_COLUMNS if c not in cols]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail={
+                    "status": "error",
+                    "error": {"code": "DB_ERROR", "message": "Lead search columns missing (apply migration 20260127_01_leads_search)", "details": missing},
+                },
+            )
+
+        keyset = ""
+        if cursor:
+            params["after_score"], params["after_created_at"], params["after_id"], params["as_of"] = _decode_search_cursor(cursor, cols["id"])
+            keyset = "WHERE (score, created_at, id) < (%(after_score)s::float8, %(after_created_at)s, %(after_id)s)"
+
+        select_cols = ["id"]
+        for c in ["intake_id", "request_id", "lead_source", "created_at", "full_name", "company", "email", "phone", "service_type", "city", "state"]:
+            if c in cols and c not in select_cols:
+                select_cols.append(c)
+
+        # One extra candidate tells us whether the window cut matches off; the
+        # LEFT JOIN keeps that flag even when the page itself is empty.
+        sql = f"""
+            WITH candidates AS (
+                SELECT {', '.join(select_cols)}, search_tsv
+                FROM app.leads
+                WHERE ({' OR '.join(match_clauses)}) AND created_at <= %(as_of)s
+                ORDER BY created_at DESC, id DESC
+                LIMIT %(candidates_probe)s
+            ), capped AS (
+                SELECT * FROM candidates
+                ORDER BY created_at DESC, id DESC
+                LIMIT %(candidates)s
+            ), hits AS (
+                SELECT {', '.join(select_cols)},
+                       (ts_rank(search_tsv, websearch_to_tsquery('simple', %(q)s))::float8
+                        + GREATEST(similarity(coalesce(full_name, ''), %(q)s),
+                                   similarity(coalesce(company, ''), %(q)s))::float8) AS score
+                FROM capped
+            )
+            SELECT (SELECT count(*) FROM candidates) > %(candidates)s AS truncated, page.*
+            FROM (SELECT 1) AS one
+            LEFT JOIN LATERAL (
+                SELECT * FROM hits
+                {keyset}
+                ORDER BY score DESC, created_at DESC, id DESC
+                LIMIT %(limit)s
+            ) AS page ON true
+            ORDER BY page.score DESC, page.created_at DESC, page.id DESC
+        """
+        with conn.cursor() as cur:
+            cur.execute(sql, params)
+            rows = cur.fetchall()
+
+    truncated = bool(rows and rows[0]["truncated"])
+    rows = [{k: v for k, v in r.items() if k != "truncated"} for r in rows if r["id"] is not None]
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = _encode_search_cursor(rows[-1], params["as_of"])
+
+    return {
+        "status": "ok",
+        "count": len(rows),
+        "limit": limit,
+        "q": q,
+        "as_of": params["as_of"].isoformat(),
+        "truncated": truncated,
+        "next_cursor": next_cursor,
+        "leads": rows,
+    }
+
+
 @app.get("/admin/leads/{lead_id}")
 def admin_get_lead(
     lead_id: str,
@@ -511,32 +902,36 @@ def admin_get_lead(
     dsn = _build_dsn()
     with psycopg.connect(dsn, connect_timeout=5, row_factory=dict_row) as conn:
         cols = _get_leads_columns(conn)
-        json_col = _pick_json_column(cols)
-
-        # Try lookup by intake_id first (most likely), then by id if present.
-        where_clauses = []
-        params = []
-        if "intake_id" in cols:
-            where_clauses.append("intake_id = %s")
-            params.append(lead_id)
-        if "id" in cols:
-            where_clauses.append("id::text = %s")
-            params.append(lead_id)
-        if not where_clauses:
+        if "intake_id" not in cols and "id" not in cols:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail={"status": "error", "error": {"code": "DB_ERROR", "message": "No id/intake_id column on app.leads"}},
             )
 
-        select_cols = list(cols.keys())
-        if json_col and json_col in select_cols:
-            # json column already included
-            pass
+        # Compare id in its own type so the primary key index applies (an OR
+        # with id::text cannot use either index). uuid/integer ids only match
+        # lead_ids of that shape; anything else goes to intake_id. Other id
+        # types (e.g. text) are compared as-is alongside intake_id.
+        where_clauses: list[str] = []
+        params: list[Any] = []
+        id_type = cols.get("id")
+        id_param = _coerce_lead_id(lead_id, id_type) if id_type else None
+        typed_id_hit = id_type in _TYPED_ID_UDTS and id_param is not None
+        if id_param is not None:
+            where_clauses.append("id = %s")
+            params.append(id_param)
+        if "intake_id" in cols and not typed_id_hit:
+            where_clauses.append("intake_id = %s")
+            params.append(lead_id)
 
-        sql = f"SELECT {', '.join(select_cols)} FROM app.leads WHERE ({' OR '.join(where_clauses)}) LIMIT 1"
-        with conn.cursor() as cur:
-            cur.execute(sql, params)
-            row = cur.fetchone()
+        row = None
+        if where_clauses:
+            # Never return the generated search vector.
+            select_cols = [c for c in cols.keys() if c != "search_tsv"]
+            sql = f"SELECT {', '.join(select_cols)} FROM app.leads WHERE ({' OR '.join(where_clauses)}) LIMIT 1"
+            with conn.cursor() as cur:
+                cur.execute(sql, params)
+                row = cur.fetchone()
 
     if not row:
         raise HTTPException(
@@ -0,0 +1,481 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    # Annotations only: the spool itself never touches Postgres directly.
+    import psycopg
+
+
+# LEADGEN_SPOOL: local durable spool for /lead/intake.
+#
+# When Postgres is unreachable (or slower than the intake budget), accepted
+# leads are appended to an append-only, segment-rotated JSON-lines log on the
+# container volume. A background drainer replays sealed segments into
+# app.intake_jobs in bulk and deletes each segment once its rows are committed.
+#
+# Durability contract: append() only returns after the record is fsync'd, so a
+# 202 served from the spool is as durable as a 202 served from Postgres.
+# Concurrent appends share a single fsync (group commit).
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+# Records Postgres rejects for non-operational reasons are moved here so one
+# bad record cannot block the segments behind it.
+QUARANTINE_FILE = "quarantine.jsonl"
+
+DRAIN_BATCH_SIZE = int(os.getenv("LEADGEN_SPOOL_DRAIN_BATCH_SIZE", "500"))
+
+
+# Same shape as the helpers in main.py / worker.py. Duplicated rather than
+# imported: main imports this module, and worker imports main.
+def _now_utc_iso() -> str:
+    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _log(event: str, **fields: Any) -> None:
+    base = {
+        "event": event,
+        "time_utc": _now_utc_iso(),
+    }
+    base.update(fields)
+    print(json.dumps(base, separators=(",", ":"), sort_keys=True))
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def _fsync_dir(path: str) -> None:
+    # Make segment creation/removal durable, not just the segment contents.
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class IntakeSpool:
+    """Append-only, fsync-batched, segment-rotated intake log.
+
+    Record shape (one JSON object per line):
+      {"job_id": "<uuid>", "idempotency_key": "<key|null>",
+       "lead_hash": "<sha256>", "payload": {"meta": {...}, "lead": {...}}}
+
+    The spool keeps an in-memory index of idempotency keys for records that
+    have not been drained yet, so a client retrying while Postgres is down gets
+    its original intake_id back (or a 409) exactly like the Postgres path.
+    Index entries only count once their record is fsync'd; a record whose write
+    or fsync fails is truncated off the segment and forgotten.
+    """
+
+    def __init__(self, directory: str, *, segment_max_bytes: int) -> None:
+        self.directory = directory
+        self.segment_max_bytes = max(1, segment_max_bytes)
+
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self._write_seq = 0
+        self._synced_seq = 0
+        self._syncing = False
+
+        # idempotency_key -> {"lead_hash": ..., "meta": {...}, "seq": ...}
+        self._index: Dict[str, Dict[str, Any]] = {}
+        # segment number -> idempotency keys / record count held in it
+        self._segment_keys: Dict[int, List[str]] = {}
+        self._segment_counts: Dict[int, int] = {}
+
+        # Records written to the active segment but not yet fsync'd:
+        # (seq, byte offset, idempotency_key). Rolled back on write/fsync failure.
+        self._unsynced: List[Tuple[int, int, Optional[str]]] = []
+        self._failed_seqs: Set[int] = set()
+        # Offset to truncate back to before the next write, if a rollback's own
+        # truncate failed (never append onto a partial line).
+        self._truncate_to: Optional[int] = None
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._recover()
+
+    # --- segment files ---
+
+    def _segment_path(self, number: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{number:012d}{SEGMENT_SUFFIX}")
+
+    def _list_segments(self) -> List[int]:
+        numbers = []
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                stem = name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]
+                if stem.isdigit():
+                    numbers.append(int(stem))
+        return sorted(numbers)
+
+    def read_segment(self, number: int) -> List[Dict[str, Any]]:
+        records: List[Dict[str, Any]] = []
+        with open(self._segment_path(number), "rb") as fh:
+            for lineno, line in enumerate(fh, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    record = None
+                if not isinstance(record, dict):
+                    # A torn tail line means the process died mid-write, before
+                    # fsync returned; that request never got a 202.
+                    _log("spool_torn_record", segment=number, line=lineno)
+                    continue
+                records.append(record)
+        return records
+
+    def _open_segment(self, number: int) -> None:
+        fd = os.open(self._segment_path(number), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+        _fsync_dir(self.directory)
+        self._active = number
+        self._fd = fd
+        self._size = os.fstat(fd).st_size
+        self._segment_keys.setdefault(number, [])
+        self._segment_counts.setdefault(number, 0)
+
+    def _recover(self) -> None:
+        # Everything found on disk at startup is sealed; new writes always go
+        # to a fresh segment so the drainer never races a half-written file.
+        segments = self._list_segments()
+        for number in segments:
+            records = self.read_segment(number)
+            self._segment_keys[number] = []
+            self._segment_counts[number] = len(records)
+            for record in records:
+                self._index_record(number, record, seq=0)
+        if segments:
+            _log("spool_recovered", segments=len(segments), pending=self._pending_locked())
+        self._open_segment((segments[-1] + 1) if segments else 1)
+
+    def _index_record(self, number: int, record: Dict[str, Any], *, seq: int) -> None:
+        key = record.get("idempotency_key")
+        if key:
+            self._index[key] = {
+                "lead_hash": record.get("lead_hash"),
+                "meta": (record.get("payload") or {}).get("meta") or {},
+                "seq": seq,
+            }
+            self._segment_keys[number].append(key)
+
+    def _truncate_locked(self, offset: int) -> None:
+        try:
+            os.ftruncate(self._fd, offset)
+        except OSError as e:
+            self._truncate_to = offset
+            _log("spool_truncate_error", segment=self._active, offset=offset, error=str(e))
+            return
+        self._size = offset
+        self._truncate_to = None
+
+    def _rollback_unsynced_locked(self) -> None:
+        # The failed fsync may have covered any of the unsynced records, and
+        # later writes sit after them in the file: drop them all.
+        if not self._unsynced:
+            return
+        offset = self._unsynced[0][1]
+        for seq, _offset, key in self._unsynced:
+            self._failed_seqs.add(seq)
+            self._segment_counts[self._active] -= 1
+            if key:
+                self._index.pop(key, None)
+                self._segment_keys[self._active].remove(key)
+        self._unsynced = []
+        self._truncate_locked(offset)
+
+    def _rotate_locked(self) -> None:
+        # Never close the active handle while another thread is fsyncing it.
+        while self._syncing:
+            self._cond.wait()
+        try:
+            os.fsync(self._fd)
+        except OSError:
+            self._rollback_unsynced_locked()
+            self._cond.notify_all()
+            raise
+        self._synced_seq = self._write_seq
+        self._unsynced = []
+        old_fd = self._fd
+        self._open_segment(self._active + 1)
+        os.close(old_fd)
+
+    # --- public API ---
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._pending_locked()
+
+    def _pending_locked(self) -> int:
+        return sum(self._segment_counts.values())
+
+    def _durable_entry_locked(self, key: str) -> Optional[Dict[str, Any]]:
+        # An entry whose fsync is still in flight is not an answer yet: wait
+        # for it to become durable (return it) or be rolled back (None).
+        while True:
+            entry = self._index.get(key)
+            if entry is None or entry["seq"] <= self._synced_seq:
+                return entry
+            self._cond.wait()
+
+    def lookup(self, idempotency_key: Optional[str]) -> Optional[Dict[str, Any]]:
+        if not idempotency_key:
+            return None
+        with self._lock:
+            return self._durable_entry_locked(idempotency_key)
+
+    def append(self, record: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Durably append a record.
+
+        Returns the existing index entry (and writes nothing) if the record's
+        idempotency key is already spooled; otherwise returns None once the
+        record has been fsync'd. Raises OSError if the write or fsync fails, in
+        which case the record is not kept.
+        """
+        line = json.dumps(record, separators=(",", ":"), ensure_ascii=False).encode("utf-8") + b"\n"
+        key = record.get("idempotency_key")
+
+        with self._lock:
+            if self._truncate_to is not None:
+                os.ftruncate(self._fd, self._truncate_to)
+                self._size = self._truncate_to
+                self._truncate_to = None
+
+            # Rotate before the idempotency check: rotation may wait on the
+            # condition (releasing the lock), and another append of the same key
+            # could land in that window.
+            if self._size >= self.segment_max_bytes:
+                self._rotate_locked()
+
+            if key:
+                existing = self._durable_entry_locked(key)
+                if existing is not None:
+                    return existing
+
+            offset = self._size
+            try:
+                _write_all(self._fd, line)
+            except OSError:
+                self._truncate_locked(offset)
+                raise
+            self._size += len(line)
+            self._write_seq += 1
+            my_seq = self._write_seq
+            self._unsynced.append((my_seq, offset, key))
+            self._segment_counts[self._active] += 1
+            self._index_record(self._active, record, seq=my_seq)
+
+            # Group commit: whoever finds no fsync in flight syncs everything
+            # written so far; everyone else waits for that fsync to cover them.
+            while True:
+                if my_seq in self._failed_seqs:
+                    self._failed_seqs.discard(my_seq)
+                    raise OSError("spool fsync failed; record rolled back")
+                if self._synced_seq >= my_seq:
+                    return None
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                target = self._write_seq
+                fd = self._fd
+                self._lock.release()
+                error: Optional[OSError] = None
+                try:
+                    os.fsync(fd)
+                except OSError as e:
+                    error = e
+                finally:
+                    self._lock.acquire()
+                    self._syncing = False
+                if error is None:
+                    self._synced_seq = max(self._synced_seq, target)
+                    self._unsynced = [u for u in self._unsynced if u[0] > target]
+                else:
+                    _log("spool_fsync_error", segment=self._active, error=str(error))
+                    self._rollback_unsynced_locked()
+                self._cond.notify_all()
+
+    def seal(self) -> List[int]:
+        """Rotate the active segment if it holds records; return sealed segments."""
+        with self._lock:
+            if self._segment_counts.get(self._active):
+                self._rotate_locked()
+            return [n for n in sorted(self._segment_counts) if n != self._active]
+
+    def quarantine(self, record: Dict[str, Any], *, error: str) -> None:
+        """Durably move a record Postgres will not accept to QUARANTINE_FILE."""
+        line = json.dumps(
+            {"quarantined_at_utc": _now_utc_iso(), "error": error, "record": record},
+            separators=(",", ":"),
+        ).encode("utf-8") + b"\n"
+        with self._lock:
+            fd = os.open(os.path.join(self.directory, QUARANTINE_FILE), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+            try:
+                _write_all(fd, line)
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        payload = record.get("payload")
+        meta = (payload.get("meta") or {}) if isinstance(payload, dict) else {}
+        _log(
+            "spool_record_quarantined",
+            job_id=str(record.get("job_id")),
+            idempotency_key=record.get("idempotency_key"),
+            intake_id=meta.get("intake_id"),
+            error=error,
+        )
+
+    def release(self, number: int) -> None:
+        """Forget a drained segment and remove it from disk."""
+        with self._lock:
+            for key in self._segment_keys.pop(number, []):
+                self._index.pop(key, None)
+            self._segment_counts.pop(number, None)
+            try:
+                os.remove(self._segment_path(number))
+            except FileNotFoundError:
+                pass
+            _fsync_dir(self.directory)
+
+
+_INSERT_JOB_SQL = """
+    INSERT INTO app.intake_jobs (id, idempotency_key, payload, status, attempt_count, last_error, created_at, updated_at)
+    VALUES (%s, %s, %s::jsonb, 'queued', 0, NULL, COALESCE(%s::timestamptz, NOW()), NOW())
+    ON CONFLICT DO NOTHING
+    RETURNING id;
+"""
+
+
+def _job_row(record: Dict[str, Any]) -> Tuple[Any, ...]:
+    return (
+        record["job_id"],
+        record.get("idempotency_key"),
+        json.dumps(record["payload"], separators=(",", ":"), ensure_ascii=False),
+        ((record["payload"].get("meta") or {}).get("received_at_utc")) or None,
+    )
+
+
+def _insert_segment(conn: "psycopg.Connection", records: List[Dict[str, Any]]) -> Set[str]:
+    rows = [_job_row(r) for r in records]
+    inserted_ids: Set[str] = set()
+    with conn.cursor() as cur:
+        for i in range(0, len(rows), DRAIN_BATCH_SIZE):
+            cur.executemany(_INSERT_JOB_SQL, rows[i:i + DRAIN_BATCH_SIZE], returning=True)
+            # One result set per row; skipped rows return nothing.
+            while True:
+                inserted_ids.update(str(r[0]) for r in cur.fetchall())
+                if not cur.nextset():
+                    break
+    conn.commit()
+    return inserted_ids
+
+
+def drain_once(
+    spool: IntakeSpool,
+    connect: Callable[[], "psycopg.Connection"],
+    *,
+    transient_errors: Tuple[type, ...],
+) -> int:
+    """Replay sealed segments into app.intake_jobs; return records drained.
+
+    Each segment is committed in one transaction before it is deleted. Replays
+    after a crash are harmless: ON CONFLICT DO NOTHING skips rows whose job id
+    (primary key) or idempotency_key is already present.
+
+    transient_errors (psycopg.OperationalError in the API) abort the drain and
+    leave the segment for the next tick. Any other failure retries the segment
+    row by row and quarantines the rows Postgres rejects, so one bad record
+    cannot block everything spooled after it.
+
+    The spool can only deduplicate keys it still holds. A key that was already
+    committed to app.intake_jobs and then retried during an outage is spooled
+    with a fresh intake_id and is skipped here; every such record is logged as
+    spool_record_dropped so the caller-visible intake_id can be reconciled.
+    """
+    if not spool.pending():
+        return 0
+
+    drained = 0
+    # Connect before sealing: while Postgres is down, sealing on every tick
+    # would rotate the active segment into a stream of tiny files.
+    with connect() as conn:
+        for number in spool.seal():
+            records = spool.read_segment(number)
+            quarantined: Set[str] = set()
+            try:
+                inserted_ids = _insert_segment(conn, records)
+            except transient_errors:
+                raise
+            except Exception as e:
+                conn.rollback()
+                _log("spool_segment_retry_rows", segment=number, records=len(records), error=str(e))
+                inserted_ids = set()
+                for r in records:
+                    try:
+                        with conn.cursor() as cur:
+                            cur.execute(_INSERT_JOB_SQL, _job_row(r))
+                            row = cur.fetchone()
+                        conn.commit()
+                    except transient_errors:
+                        raise
+                    except Exception as row_error:
+                        conn.rollback()
+                        spool.quarantine(r, error=str(row_error))
+                        quarantined.add(str(r.get("job_id")))
+                        continue
+                    if row is not None:
+                        inserted_ids.add(str(row[0]))
+
+            spool.release(number)
+            drained += len(records)
+
+            for r in records:
+                job_id = str(r.get("job_id"))
+                if job_id not in inserted_ids and job_id not in quarantined:
+                    _log(
+                        "spool_record_dropped",
+                        segment=number,
+                        job_id=job_id,
+                        idempotency_key=r.get("idempotency_key"),
+                        intake_id=(r["payload"].get("meta") or {}).get("intake_id"),
+                        reason="conflict",
+                    )
+            _log(
+                "spool_segment_drained",
+                segment=number,
+                records=len(records),
+                inserted=len(inserted_ids),
+                quarantined=len(quarantined),
+            )
+    return drained
+
+
+def start_drainer(
+    spool: IntakeSpool,
+    connect: Callable[[], "psycopg.Connection"],
+    *,
+    interval_seconds: float,
+    stop: threading.Event,
+    transient_errors: Tuple[type, ...],
+) -> threading.Thread:
+    def _run() -> None:
+        while not stop.is_set():
+            try:
+                drain_once(spool, connect, transient_errors=transient_errors)
+            except Exception as e:
+                # Postgres still down: keep the segments and try again later.
+                _log("spool_drain_error", error=str(e), pending=spool.pending())
+            stop.wait(interval_seconds)
+
+    thread = threading.Thread(target=_run, name="leadgen-spool-drainer", daemon=True)
+    thread.start()
+    return thread
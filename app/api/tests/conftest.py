@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The API image runs from app/api (``leadgen_api.main:app``); make that importable
+# however pytest is invoked (repo root or app/api).
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,284 @@
+import asyncio
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import psycopg
+import pytest
+from fastapi import HTTPException
+
+from leadgen_api import main
+from leadgen_api.spool import IntakeSpool
+
+
+INTAKE_KEY = "test-intake-key"
+
+
+def _lead(**request_overrides):
+    request = {
+        "service_type": "armed_security",
+        "timeline": {"start_local": "2026-02-01T08:00:00-06:00"},
+        "location": {"city": "Houston", "state": "TX"},
+    }
+    request.update(request_overrides)
+    return {"contact": {"full_name": "Jane Doe", "phone": "+1-713-555-0199"}, "request": request}
+
+
+@pytest.fixture(autouse=True)
+def _intake_key(monkeypatch):
+    monkeypatch.setattr(main, "INTAKE_API_KEY", INTAKE_KEY)
+
+
+def _post_intake(body, *, idempotency_key=None):
+    return asyncio.run(main.lead_intake(
+        payload=main.LeadIntakeRequest.model_validate(body),
+        request=SimpleNamespace(client=None),
+        x_api_key=INTAKE_KEY,
+        idempotency_key=idempotency_key,
+        x_request_id=None,
+        x_lead_source=None,
+    ))
+
+
+def test_find_unstorable_text():
+    assert main._find_unstorable_text({"a": "ok", "b": [1, "fine"]}) is None
+    assert main._find_unstorable_text({"request": {"notes": "x\x00y"}}) == "request.notes"
+    assert main._find_unstorable_text({"tags": ["ok", "\ud800"]}) == "tags[1]"
+
+
+def test_intake_rejects_nul_before_any_queue(monkeypatch):
+    def _unexpected(**_job):
+        raise AssertionError("must not enqueue")
+
+    monkeypatch.setattr(main, "_accept_intake_job", _unexpected)
+    with pytest.raises(HTTPException) as exc:
+        _post_intake(_lead(notes="nul\u0000byte"))
+
+    assert exc.value.status_code == 422
+    assert exc.value.detail["error"]["details"] == [{"field": "request.notes", "issue": "unsupported_characters"}]
+
+
+def _job(idempotency_key="key-1", intake_id="li_1", lead=None):
+    return {
+        "idempotency_key": idempotency_key,
+        "intake_id": intake_id,
+        "request_id": f"req_{intake_id}",
+        "received_at_utc": "2026-02-01T14:00:00Z",
+        "lead_source": "test",
+        "payload": lead if lead is not None else _lead(),
+    }
+
+
+@pytest.fixture
+def spool(tmp_path, monkeypatch):
+    s = IntakeSpool(str(tmp_path), segment_max_bytes=16 * 1024 * 1024)
+    monkeypatch.setattr(main, "_SPOOL", s)
+    monkeypatch.setattr(main, "_DB_BYPASS_UNTIL", 0.0)
+    return s
+
+
+@pytest.fixture
+def db_down(monkeypatch):
+    calls = []
+
+    def _connect(*args, **kwargs):
+        calls.append(kwargs)
+        raise psycopg.OperationalError("connection refused")
+
+    monkeypatch.setattr(main.psycopg, "connect", _connect)
+    return calls
+
+
+def test_operational_error_falls_back_to_spool(spool, db_down):
+    meta = main._accept_intake_job(**_job())
+
+    assert meta == {
+        "intake_id": "li_1",
+        "request_id": "req_li_1",
+        "received_at_utc": "2026-02-01T14:00:00Z",
+        "queue": "spool",
+    }
+    assert spool.pending() == 1
+    # The DB attempt uses the short spool budget.
+    assert db_down[0]["connect_timeout"] == main.SPOOL_DB_CONNECT_TIMEOUT_SECONDS
+
+
+def test_bypass_window_skips_postgres(spool, db_down, monkeypatch):
+    main._accept_intake_job(**_job(idempotency_key="a", intake_id="li_a"))
+    main._accept_intake_job(**_job(idempotency_key="b", intake_id="li_b"))
+    assert len(db_down) == 1
+
+    monkeypatch.setattr(main, "_DB_BYPASS_UNTIL", 0.0)
+    main._accept_intake_job(**_job(idempotency_key="c", intake_id="li_c"))
+    assert len(db_down) == 2
+    assert spool.pending() == 3
+
+
+def test_spooled_key_returns_original_meta_or_409(spool, db_down):
+    main._accept_intake_job(**_job(intake_id="li_first"))
+
+    retry = main._accept_intake_job(**_job(intake_id="li_retry"))
+    assert retry["intake_id"] == "li_first"
+    assert retry["queue"] == "spool"
+    assert spool.pending() == 1
+
+    with pytest.raises(HTTPException) as exc:
+        main._accept_intake_job(**_job(intake_id="li_other", lead=_lead(notes="different")))
+    assert exc.value.status_code == 409
+
+
+def test_spooled_key_is_answered_without_postgres(spool, db_down, monkeypatch):
+    main._accept_intake_job(**_job(intake_id="li_first"))
+    monkeypatch.setattr(main, "_DB_BYPASS_UNTIL", 0.0)
+
+    retry = main._accept_intake_job(**_job(intake_id="li_retry"))
+    assert retry["intake_id"] == "li_first"
+    assert len(db_down) == 1
+
+
+def test_non_operational_db_error_is_not_spooled(spool, monkeypatch):
+    class _Conn:
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def _enqueue(_conn, **_job):
+        raise psycopg.errors.UniqueViolation("duplicate key value")
+
+    monkeypatch.setattr(main.psycopg, "connect", lambda *a, **k: _Conn())
+    monkeypatch.setattr(main, "_enqueue_intake_job", _enqueue)
+
+    with pytest.raises(psycopg.IntegrityError):
+        main._accept_intake_job(**_job())
+    assert spool.pending() == 0
+    assert main._DB_BYPASS_UNTIL == 0.0
+
+
+def test_coerce_lead_id():
+    lead_uuid = "6f1c2d7e-3b4a-4c5d-8e9f-0a1b2c3d4e5f"
+    assert str(main._coerce_lead_id(lead_uuid, "uuid")) == lead_uuid
+    assert main._coerce_lead_id("li_abc", "uuid") is None
+    assert main._coerce_lead_id("42", "int8") == 42
+    assert main._coerce_lead_id("²", "int4") is None
+    assert main._coerce_lead_id("٣", "int4") is None
+    assert main._coerce_lead_id(str(2 ** 63), "int8") is None
+    assert main._coerce_lead_id("li_abc", "text") == "li_abc"
+
+
+@pytest.mark.parametrize("id_udt, lead_id", [
+    ("uuid", uuid.UUID("6f1c2d7e-3b4a-4c5d-8e9f-0a1b2c3d4e5f")),
+    ("int8", 42),
+    ("text", "lead-42"),
+])
+def test_search_cursor_round_trip(id_udt, lead_id):
+    created_at = datetime(2026, 2, 1, 14, 0, 0, 123456, tzinfo=timezone.utc)
+    score = 0.1 + 0.2  # not exactly representable in decimal
+    as_of = datetime(2026, 2, 2, tzinfo=timezone.utc)
+    cursor = main._encode_search_cursor({"score": score, "created_at": created_at, "id": lead_id}, as_of)
+
+    assert main._decode_search_cursor(cursor, id_udt) == (score, created_at, lead_id, as_of)
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", "W10", "WyIxIiwibm90LWEtZGF0ZSIsIjEiXQ"])
+def test_search_cursor_rejects_garbage(cursor):
+    with pytest.raises(HTTPException) as exc:
+        main._decode_search_cursor(cursor, "uuid")
+    assert exc.value.status_code == 422
+
+
+def test_search_cursor_rejects_id_of_wrong_type():
+    created_at = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    cursor = main._encode_search_cursor({"score": 1.0, "created_at": created_at, "id": "li_abc"}, created_at)
+    with pytest.raises(HTTPException):
+        main._decode_search_cursor(cursor, "int8")
+
+
+def test_like_pattern_escapes_wildcards():
+    assert main._like_pattern("jane") == "%jane%"
+    assert main._like_pattern("50%_off\\") == "%50\\%\\_off\\\\%"
+
+
+ADMIN_KEY = "test-admin-key"
+_SEARCH_COLS = {c: "text" for c in main._SEARCH_REQUIRED_COLUMNS}
+_SEARCH_COLS.update({"id": "uuid", "created_at": "timestamptz", "search_tsv": "tsvector"})
+
+
+class _SearchConn:
+    def __init__(self, rows):
+        self.rows = rows
+        self.executed = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        conn = self
+
+        class _Cur:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                return False
+
+            def execute(self, sql, params):
+                conn.executed.append((sql, params))
+
+            def fetchall(self):
+                return conn.rows
+
+        return _Cur()
+
+
+@pytest.fixture
+def search_db(monkeypatch):
+    monkeypatch.setattr(main, "ADMIN_API_KEY", ADMIN_KEY)
+    monkeypatch.setattr(main, "_get_leads_columns", lambda _conn: _SEARCH_COLS)
+    holder = {}
+
+    def _connect(*_args, **_kwargs):
+        return holder["conn"]
+
+    monkeypatch.setattr(main.psycopg, "connect", _connect)
+    return holder
+
+
+def _search(q, *, limit=25, cursor=None):
+    return main.admin_search_leads(q=q, limit=limit, cursor=cursor, x_admin_key=ADMIN_KEY)
+
+
+@pytest.mark.parametrize("q", ["a", " b ", "x" * 201])
+def test_search_rejects_bad_query_length(search_db, q):
+    with pytest.raises(HTTPException) as exc:
+        _search(q)
+    assert exc.value.status_code == 422
+
+
+def test_search_reports_truncation_and_pins_window(search_db):
+    created_at = datetime(2026, 2, 1, tzinfo=timezone.utc)
+    rows = [
+        {"truncated": True, "id": uuid.uuid4(), "created_at": created_at, "score": 1.0 - i / 10}
+        for i in range(3)
+    ]
+    search_db["conn"] = _SearchConn(rows)
+
+    page = _search("jane", limit=2)
+    assert page["truncated"] is True
+    assert page["count"] == 2
+    assert all("truncated" not in lead for lead in page["leads"])
+
+    first_as_of = search_db["conn"].executed[0][1]["as_of"]
+    search_db["conn"] = _SearchConn([{"truncated": True, "id": None, "created_at": None, "score": None}])
+    page2 = _search("jane", limit=2, cursor=page["next_cursor"])
+    _sql, params = search_db["conn"].executed[0]
+    assert params["as_of"] == first_as_of
+    assert params["after_id"] == rows[1]["id"]
+    # An empty page still carries the truncation flag.
+    assert page2["count"] == 0
+    assert page2["truncated"] is True
+    assert page2["next_cursor"] is None
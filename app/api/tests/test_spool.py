@@ -0,0 +1,273 @@
+import json
+import os
+import threading
+
+import pytest
+
+from leadgen_api import spool as spool_module
+from leadgen_api.spool import IntakeSpool, drain_once
+
+
+def _record(i: int, key: str) -> dict:
+    return {
+        "job_id": f"job-{i}",
+        "idempotency_key": key,
+        "lead_hash": "h",
+        "payload": {"meta": {"intake_id": f"li_{i}"}, "lead": {}},
+    }
+
+
+def _append_concurrently(spool: IntakeSpool, n: int, keys: int) -> list:
+    results = [None] * n
+    start = threading.Barrier(n)
+
+    def _run(i: int) -> None:
+        start.wait()
+        results[i] = spool.append(_record(i, f"k{i % keys}"))
+
+    threads = [threading.Thread(target=_run, args=(i,)) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def _spooled_keys(spool: IntakeSpool) -> list:
+    keys = []
+    for name in sorted(os.listdir(spool.directory)):
+        number = int(name[len("segment-"):-len(".jsonl")])
+        keys += [r["idempotency_key"] for r in spool.read_segment(number)]
+    return keys
+
+
+def test_concurrent_appends_with_rotation_spool_each_key_once(tmp_path):
+    # Tiny segments force a rotation on nearly every append; rotation waits on
+    # the condition, which is where a duplicate key used to slip through.
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=300)
+    results = _append_concurrently(spool, n=200, keys=50)
+
+    keys = _spooled_keys(spool)
+    assert len(keys) == 50
+    assert len(set(keys)) == 50
+    assert sum(r is None for r in results) == 50
+    assert spool.pending() == 50
+
+
+def test_concurrent_appends_without_rotation_spool_each_key_once(tmp_path):
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=16 * 1024 * 1024)
+    results = _append_concurrently(spool, n=200, keys=50)
+
+    assert len(_spooled_keys(spool)) == 50
+    assert sum(r is None for r in results) == 50
+
+
+def test_recovered_spool_keeps_index_until_release(tmp_path):
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=300)
+    _append_concurrently(spool, n=20, keys=10)
+
+    reopened = IntakeSpool(str(tmp_path), segment_max_bytes=300)
+    assert reopened.pending() == 10
+    assert reopened.lookup("k3") is not None
+
+    for number in reopened.seal():
+        reopened.release(number)
+    assert reopened.pending() == 0
+    assert reopened.lookup("k3") is None
+
+
+def test_drain_does_not_rotate_while_postgres_is_down(tmp_path):
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=16 * 1024 * 1024)
+
+    def _connect():
+        raise ConnectionError("postgres down")
+
+    for i in range(5):
+        spool.append(_record(i, f"k{i}"))
+        with pytest.raises(ConnectionError):
+            drain_once(spool, _connect, transient_errors=(ConnectionError,))
+
+    assert len(os.listdir(tmp_path)) == 1
+    assert spool.pending() == 5
+
+
+def test_failed_fsync_rolls_record_back(tmp_path, monkeypatch):
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=16 * 1024 * 1024)
+    real_fsync = os.fsync
+    calls = {"n": 0}
+
+    def _flaky_fsync(fd):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            raise OSError(5, "EIO")
+        real_fsync(fd)
+
+    monkeypatch.setattr(spool_module.os, "fsync", _flaky_fsync)
+    with pytest.raises(OSError):
+        spool.append(_record(1, "k1"))
+
+    # A retry must not be answered from a record that never became durable.
+    assert spool.lookup("k1") is None
+    assert spool.pending() == 0
+    assert spool.append(_record(2, "k1")) is None
+    assert spool.lookup("k1")["meta"]["intake_id"] == "li_2"
+    assert [r["job_id"] for r in spool.read_segment(1)] == ["job-2"]
+
+
+def test_partial_write_is_truncated(tmp_path, monkeypatch, capsys):
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=16 * 1024 * 1024)
+    real_write = os.write
+    calls = {"n": 0}
+
+    def _short_write(fd, data):
+        calls["n"] += 1
+        if calls["n"] == 1:
+            return real_write(fd, bytes(data[: len(data) // 2]))
+        if calls["n"] == 2:
+            raise OSError(28, "ENOSPC")
+        return real_write(fd, data)
+
+    monkeypatch.setattr(spool_module.os, "write", _short_write)
+    with pytest.raises(OSError):
+        spool.append(_record(1, "k1"))
+    assert spool.append(_record(2, "k2")) is None
+
+    assert [r["job_id"] for r in spool.read_segment(1)] == ["job-2"]
+    assert "spool_torn_record" not in capsys.readouterr().out
+
+
+class _Transient(Exception):
+    pass
+
+
+class _Rejected(Exception):
+    pass
+
+
+class _FakeDB:
+    """In-memory app.intake_jobs with PK + unique idempotency_key and transactions."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.staged = {}
+        self.fail_transient = False
+
+    def insert(self, row):
+        job_id, key, payload_json, _created_at = row
+        if self.fail_transient:
+            raise _Transient("connection lost")
+        if "\\u0000" in payload_json:
+            raise _Rejected("unsupported Unicode escape sequence")
+        rows = {**self.jobs, **self.staged}
+        if job_id in rows or (key and any(r["idempotency_key"] == key for r in rows.values())):
+            return None
+        self.staged[job_id] = {"idempotency_key": key, "payload": payload_json}
+        return (job_id,)
+
+
+class _FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self.results = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def executemany(self, _sql, rows, returning=False):
+        self.results = [[r] if r else [] for r in (self.db.insert(row) for row in rows)]
+
+    def execute(self, _sql, row):
+        r = self.db.insert(row)
+        self.results = [[r] if r else []]
+
+    def fetchall(self):
+        return self.results[0]
+
+    def fetchone(self):
+        return self.results[0][0] if self.results[0] else None
+
+    def nextset(self):
+        self.results = self.results[1:]
+        return True if self.results else None
+
+
+class _FakeConn:
+    def __init__(self, db):
+        self.db = db
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def cursor(self):
+        return _FakeCursor(self.db)
+
+    def commit(self):
+        self.db.jobs.update(self.db.staged)
+        self.db.staged = {}
+
+    def rollback(self):
+        self.db.staged = {}
+
+
+def _drain(spool, db):
+    return drain_once(spool, lambda: _FakeConn(db), transient_errors=(_Transient,))
+
+
+def test_drain_replays_segments_and_logs_conflicts(tmp_path, capsys):
+    db = _FakeDB()
+    db.jobs["job-existing"] = {"idempotency_key": "k0", "payload": "{}"}
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=300)
+    for i in range(5):
+        spool.append(_record(i, f"k{i}"))
+
+    assert _drain(spool, db) == 5
+    assert spool.pending() == 0
+    assert sorted(db.jobs) == ["job-1", "job-2", "job-3", "job-4", "job-existing"]
+    out = capsys.readouterr().out
+    assert '"event":"spool_record_dropped"' in out
+    assert '"intake_id":"li_0"' in out
+
+    # Replaying the same records (e.g. crash before segment delete) is a no-op.
+    spool.append(_record(1, "k1"))
+    _drain(spool, db)
+    assert len(db.jobs) == 5
+
+
+def test_drain_quarantines_rejected_rows_and_keeps_going(tmp_path):
+    db = _FakeDB()
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=16 * 1024 * 1024)
+    bad = _record(1, "k1")
+    bad["payload"]["lead"] = {"notes": "nul\u0000byte"}
+    spool.append(_record(0, "k0"))
+    spool.append(bad)
+    spool.append(_record(2, "k2"))
+
+    assert _drain(spool, db) == 3
+    assert sorted(db.jobs) == ["job-0", "job-2"]
+    assert spool.pending() == 0
+
+    with open(os.path.join(str(tmp_path), spool_module.QUARANTINE_FILE)) as fh:
+        quarantined = [json.loads(line) for line in fh]
+    assert [q["record"]["job_id"] for q in quarantined] == ["job-1"]
+
+
+def test_drain_keeps_segment_on_transient_error(tmp_path):
+    db = _FakeDB()
+    db.fail_transient = True
+    spool = IntakeSpool(str(tmp_path), segment_max_bytes=16 * 1024 * 1024)
+    spool.append(_record(0, "k0"))
+
+    with pytest.raises(_Transient):
+        _drain(spool, db)
+    assert spool.pending() == 1
+    assert not os.path.exists(os.path.join(str(tmp_path), spool_module.QUARANTINE_FILE))
+
+    db.fail_transient = False
+    assert _drain(spool, db) == 1
+    assert list(db.jobs) == ["job-0"]
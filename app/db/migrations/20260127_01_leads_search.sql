@@ -0,0 +1,55 @@
+-- LeadGen — admin lead search (schema: app)
+-- Migration: 20260127_01_leads_search
+-- Idempotent: safe to re-run.
+--
+-- Backs GET /admin/leads/search:
+--   - search_tsv: maintained full-text vector over contact + notes (ranked)
+--   - pg_trgm GIN indexes: fuzzy / fragment matching on contact + notes
+--   - phone digits expression index: "7135550199" matches "+1-713-555-0199"
+-- Also indexes intake_id so GET /admin/leads/{lead_id} is an index lookup.
+--
+-- NOTE: adding the generated column rewrites app.leads; run in a maintenance
+-- window on large tables.
+
+BEGIN;
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- Public intake id (li_...) written by the worker; lookups go through this.
+ALTER TABLE app.leads ADD COLUMN IF NOT EXISTS intake_id TEXT NULL;
+CREATE INDEX IF NOT EXISTS leads_intake_id_idx
+  ON app.leads (intake_id)
+  WHERE intake_id IS NOT NULL;
+
+-- Full-text vector. 'simple' config: names, companies and emails must not be
+-- stemmed, and notes are short enough that exact-token matching is fine.
+ALTER TABLE app.leads ADD COLUMN IF NOT EXISTS search_tsv tsvector
+  GENERATED ALWAYS AS (
+    setweight(to_tsvector('simple', coalesce(full_name, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(company, '')), 'A') ||
+    setweight(to_tsvector('simple', coalesce(email, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(phone, '')), 'B') ||
+    setweight(to_tsvector('simple', coalesce(notes, '')), 'C')
+  ) STORED;
+
+CREATE INDEX IF NOT EXISTS leads_search_tsv_idx ON app.leads USING gin (search_tsv);
+
+-- Trigram indexes (serve ILIKE '%fragment%' and similarity ranking)
+CREATE INDEX IF NOT EXISTS leads_full_name_trgm_idx ON app.leads USING gin (full_name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS leads_company_trgm_idx ON app.leads USING gin (company gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS leads_email_trgm_idx ON app.leads USING gin (email gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS leads_notes_trgm_idx ON app.leads USING gin (notes gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS leads_phone_digits_trgm_idx
+  ON app.leads USING gin ((regexp_replace(phone, '\D', '', 'g')) gin_trgm_ops);
+
+-- Recency order of search candidates (created_at DESC, id DESC) and the
+-- keyset tiebreak. Whether the planner walks this index or top-N sorts the
+-- bitmap-OR of the match indexes depends on how selective the term is.
+CREATE INDEX IF NOT EXISTS leads_created_at_id_idx ON app.leads (created_at DESC, id DESC);
+
+-- Record migration
+INSERT INTO app.schema_migrations (version)
+VALUES ('20260127_01_leads_search')
+ON CONFLICT (version) DO NOTHING;
+
+COMMIT;